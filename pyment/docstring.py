@@ -2,6 +2,7 @@
 
 import re
 from collections import defaultdict
+from types import MappingProxyType
 
 __author__ = "A. Daouzli"
 __copyright__ = "Copyright 2012-2018, A. Daouzli"
@@ -20,7 +21,13 @@ Formats supported at the time:
 
 """
 
-RAISES_NAME_REGEX = r'^([\w.]+)'
+RAISES_NAME_REGEX = re.compile(r'^([\w.]+)')
+LEADING_SPACES_REGEX = re.compile(r'\s*')
+FIRST_WORD_REGEX = re.compile(r'\W*(\w+)')
+GROUP_PARAM_REGEX = re.compile(r'^\W*(\w+)(?:[\W\s]+(\w[\s\w]+))?')
+GROUP_RAISES_REGEX = re.compile(r'^\W*([\w.]+)[\W\s]+(\w[\s\w]+)')
+PARAM_NAME_REGEX = re.compile(r'^([\w]+)')
+PARAM_TYPE_REGEX = re.compile(r'\W*(\w+)\W+(\w+)\W*')
 
 
 def isin_alone(elems, line):
@@ -31,8 +38,9 @@ def isin_alone(elems, line):
 
     """
     found = False
+    line = line.strip().lower()
     for e in elems:
-        if line.strip().lower() == e.lower():
+        if line == e.lower():
             found = True
             break
     return found
@@ -41,17 +49,12 @@ def isin_alone(elems, line):
 def isin_start(elems, line):
     """Check if an element from a list starts a string.
 
-    :type elems: list
+    :type elems: list, tuple or str
     :type line: str
 
     """
-    found = False
-    elems = [elems] if type(elems) is not list else elems
-    for e in elems:
-        if line.lstrip().lower().startswith(e):
-            found = True
-            break
-    return found
+    elems = (elems,) if isinstance(elems, str) else tuple(elems)
+    return line.lstrip().lower().startswith(elems)
 
 
 def isin(elems, line):
@@ -62,24 +65,45 @@ def isin(elems, line):
 
     """
     found = False
+    line = line.lower()
     for e in elems:
-        if e in line.lower():
+        if e in line:
             found = True
             break
     return found
 
 
+def isin_underline(line):
+    """Check if a string is only made of dashes, like a section's underline.
+
+    :type line: str
+
+    """
+    line = line.strip()
+    return bool(line) and not line.strip('-')
+
+
 def get_leading_spaces(data):
     """Get the leading space of a string if it is not empty
 
     :type data: str
 
     """
-    spaces = ''
-    m = re.match(r'^(\s*)', data)
-    if m:
-        spaces = m.group(1)
-    return spaces
+    return LEADING_SPACES_REGEX.match(data).group(0)
+
+
+def strip_quotes(data):
+    """Get the content of a docstring without its surrounding spaces and quotes
+
+    :type data: str
+
+    """
+    data = data.strip()
+    if data.startswith(('"""', "'''")):
+        data = data[3:]
+    if data.endswith(('"""', "'''")):
+        data = data[:-3]
+    return data
 
 
 class DocToolsBase(object):
@@ -156,6 +180,9 @@ class DocToolsBase(object):
         :param key: the key
 
         """
+        if self.opt[key] not in data.lower():
+            # no section for this key so no need to go through the lines
+            return []
         data = data.splitlines()
         init = self.get_section_key_line(data, key)
         if init == -1:
@@ -351,7 +378,7 @@ class NumpydocTools(DocToolsBase):
         for i, line in enumerate(data):
             if start != -1:
                 # we found the key so check if this is the underline
-                if line.strip() and isin_alone(['-' * len(line.strip())], line):
+                if isin_underline(line):
                     break
                 else:
                     start = -1
@@ -416,6 +443,9 @@ class NumpydocTools(DocToolsBase):
         """
         keys = ['also', 'ref', 'note', 'other', 'example', 'method', 'attr']
         elems = [self.opt[k] for k in self.opt if k in keys]
+        if not isin(elems, data):
+            # none of these sections so no need to go through the lines
+            return ''
         data = data.splitlines()
         start = 0
         init = 0
@@ -585,6 +615,10 @@ class DocsTools(object):
     # TODO: enhance style dependent separation
     # TODO: add set methods to generate style specific outputs
     # TODO: manage C style (\param)
+
+    # options of the tag styles and groups, shared by all the instances once built
+    _available_styles = None
+
     def __init__(self, style_in='javadoc', style_out='reST', params=None):
         """Choose the kind of docstring type.
 
@@ -598,8 +632,6 @@ class DocsTools(object):
         """
         self.style = {'in': style_in,
                       'out': style_out}
-        self.opt = {}
-        self.tagstyles = []
         self._set_available_styles()
         self.params = params
         self.numpydoc = NumpydocTools()
@@ -623,26 +655,38 @@ class DocsTools(object):
             return: 'returns', 'return'
             raise:  'raises', 'raise', 'exceptions', 'exception'
 
+        The tag styles are also provided with the 'unknown' style, as they are parsed the same way.
+
+        As these options never change, they are built once and shared by all the instances,
+        as read-only mappings and tuples.
+
         """
-        options_tagstyle = {'keys': ['param', 'type', 'returns', 'return', 'rtype', 'raise'],
-                            'styles': {'javadoc': ('@', ':'),  # tuple:  key prefix, separator
-                                       'reST': (':', ':'),
-                                       'cstyle': ('\\', ' ')}
-                           }
-        self.tagstyles = list(options_tagstyle['styles'].keys())
-        for op in options_tagstyle['keys']:
-            self.opt[op] = {}
-            for style in options_tagstyle['styles']:
-                self.opt[op][style] = {'name': options_tagstyle['styles'][style][0] + op,
-                                       'sep': options_tagstyle['styles'][style][1]
-                                      }
-        self.opt['return']['reST']['name'] = ':returns'
-        self.opt['raise']['reST']['name'] = ':raises'
-        self.groups = {
-                    'param': ['params', 'args', 'parameters', 'arguments'],
-                    'return': ['returns', 'return'],
-                    'raise': ['raises', 'exceptions', 'raise', 'exception']
-                    }
+        if DocsTools._available_styles is None:
+            options_tagstyle = {'keys': ['param', 'type', 'returns', 'return', 'rtype', 'raise'],
+                                'styles': {'javadoc': ('@', ':'),  # tuple:  key prefix, separator
+                                           'reST': (':', ':'),
+                                           'cstyle': ('\\', ' ')}
+                               }
+            tagstyles = tuple(options_tagstyle['styles'].keys())
+            opt = {}
+            for op in options_tagstyle['keys']:
+                opt[op] = {}
+                for style in options_tagstyle['styles']:
+                    opt[op][style] = {'name': options_tagstyle['styles'][style][0] + op,
+                                      'sep': options_tagstyle['styles'][style][1]
+                                     }
+            opt['return']['reST']['name'] = ':returns'
+            opt['raise']['reST']['name'] = ':raises'
+            groups = {
+                        'param': ('params', 'args', 'parameters', 'arguments'),
+                        'return': ('returns', 'return'),
+                        'raise': ('raises', 'exceptions', 'raise', 'exception')
+                        }
+            # read-only views so that no instance can alter the shared options
+            opt = MappingProxyType({op: MappingProxyType({style: MappingProxyType(d) for style, d in styles.items()})
+                                    for op, styles in opt.items()})
+            DocsTools._available_styles = (opt, tagstyles, tagstyles + ('unknown',), MappingProxyType(groups))
+        self.opt, self.tagstyles, self.tagstyles_unknown, self.groups = DocsTools._available_styles
 
     def autodetect_style(self, data):
         """Determine the style of a docstring,
@@ -677,7 +721,7 @@ class DocsTools(object):
                     found_googledoc += 1 if isin_start(self.googledoc[key], line) else 0
                 for key in self.numpydoc:
                     found_numpydoc += 1 if isin_start(self.numpydoc[key], line) else 0
-                if line.strip() and isin_alone(['-' * len(line.strip())], line):
+                if isin_underline(line):
                     found_numpydocsep += 1
                 elif isin(self.numpydoc.keywords, line):
                     found_numpydoc += 1
@@ -762,6 +806,9 @@ class DocsTools(object):
 
         """
         start, end = -1, -1
+        if '>>>' not in data:
+            # no need to split the lines if there is no doctest
+            return start, end
         datalst = data.splitlines()
         for i, line in enumerate(datalst):
             if start > -1:
@@ -853,22 +900,22 @@ class DocsTools(object):
         idx = len(data)
         ini = 0
         loop = True
-        if key in data:
-            while loop:
-                i = data.find(key)
-                if i != -1:
-                    if starting:
-                        if not data[:i].rstrip(' \t').endswith('\n') and len(data[:i].strip()) > 0:
-                            ini = i + 1
-                            data = data[ini:]
-                        else:
-                            idx = ini + i
-                            loop = False
+        while loop:
+            i = data.find(key)
+            if i != -1:
+                if starting:
+                    before = data[:i]
+                    if not before.rstrip(' \t').endswith('\n') and len(before.strip()) > 0:
+                        ini = i + 1
+                        data = data[ini:]
                     else:
                         idx = ini + i
                         loop = False
                 else:
+                    idx = ini + i
                     loop = False
+            else:
+                loop = False
         if idx == len(data):
             idx = -1
         return idx
@@ -912,11 +959,11 @@ class DocsTools(object):
         """
         start, end = -1, -1
         stl_param = self.opt['raise'][self.style['in']]['name']
-        if self.style['in'] in self.tagstyles + ['unknown']:
+        if self.style['in'] in self.tagstyles_unknown:
             idx_p = self.get_key_index(data, 'raise')
             if idx_p >= 0:
                 idx_p += len(stl_param)
-                m = re.match(RAISES_NAME_REGEX, data[idx_p:].strip())
+                m = RAISES_NAME_REGEX.match(data[idx_p:].strip())
                 if m:
                     param = m.group(1)
                     start = idx_p + data[idx_p:].find(param)
@@ -946,13 +993,13 @@ class DocsTools(object):
             _, prev = self.get_raise_indexes(data)
         if prev < 0:
             return -1, -1
-        m = re.match(r'\W*(\w+)', data[prev:])
+        m = FIRST_WORD_REGEX.match(data[prev:])
         if m:
             first = m.group(1)
             start = data[prev:].find(first)
             if start >= 0:
                 start += prev
-                if self.style['in'] in self.tagstyles + ['unknown']:
+                if self.style['in'] in self.tagstyles_unknown:
                     end = self.get_elem_index(data[start:])
                     if end >= 0:
                         end += start
@@ -1039,7 +1086,6 @@ class DocsTools(object):
 
     def _extract_not_tagstyle_old_way(self, data):
         ret = {}
-        listed = 0
         loop = True
         maxi = 10000  # avoid infinite loop but should never happen
         i = 0
@@ -1065,7 +1111,6 @@ class DocsTools(object):
                     print(f"WARNING: unexpected parsing duplication of docstring parameter '{param}'")
                 ret[param] = {'type': ptype, 'type_in_param': None, 'description': desc}
                 data = data[end:]
-                listed += 1
             else:
                 loop = False
         if i > maxi:
@@ -1075,8 +1120,7 @@ class DocsTools(object):
     def extract_elements(self, data) -> dict:
         """Extract parameter name, description and type from docstring"""
         ret = []
-        tagstyles = self.tagstyles + ['unknown']
-        if self.style['in'] in tagstyles:
+        if self.style['in'] in self.tagstyles_unknown:
             ret = self._extra_tagstyle_elements(data)
         else:
             # fixme enhance management of other styles
@@ -1097,14 +1141,15 @@ class DocsTools(object):
         # TODO: new method to extract an element's name so will be available for @param and @types and other styles (:param, \param)
         start, end = -1, -1
         stl_param = self.opt['param'][self.style['in']]['name']
-        if self.style['in'] in self.tagstyles + ['unknown']:
+        if self.style['in'] in self.tagstyles_unknown:
             idx_p = self.get_key_index(data, 'param')
             if idx_p >= 0:
                 idx_p += len(stl_param)
-                m = re.match(r'^([\w]+)', data[idx_p:].strip())
+                rest = data[idx_p:]
+                m = PARAM_NAME_REGEX.match(rest.strip())
                 if m:
                     param = m.group(1)
-                    start = idx_p + data[idx_p:].find(param)
+                    start = idx_p + rest.find(param)
                     end = start + len(param)
 
         if self.style['in'] in ['groups', 'unknown'] and (start, end) == (-1, -1):
@@ -1145,7 +1190,7 @@ class DocsTools(object):
             _, prev = self.get_param_indexes(data)
         if prev < 0:
             return -1, -1
-        m = re.match(r'\W*(\w+)', data[prev:])
+        m = FIRST_WORD_REGEX.match(data[prev:])
         if m:
             first = m.group(1)
             start = data[prev:].find(first)
@@ -1154,7 +1199,7 @@ class DocsTools(object):
                     # avoid to get next element as a description
                     return -1, -1
                 start += prev
-                if self.style['in'] in self.tagstyles + ['unknown']:
+                if self.style['in'] in self.tagstyles_unknown:
                     end = self.get_elem_index(data[start:])
                     if end >= 0:
                         end += start
@@ -1185,11 +1230,11 @@ class DocsTools(object):
         if not prev:
             _, prev = self.get_param_description_indexes(data)
         if prev >= 0:
-            if self.style['in'] in self.tagstyles + ['unknown']:
+            if self.style['in'] in self.tagstyles_unknown:
                 idx = self.get_elem_index(data[prev:])
                 if idx >= 0 and data[prev + idx:].startswith(stl_type):
                     idx = prev + idx + len(stl_type)
-                    m = re.match(r'\W*(\w+)\W+(\w+)\W*', data[idx:].strip())
+                    m = PARAM_TYPE_REGEX.match(data[idx:].strip())
                     if m:
                         param = m.group(1).strip()
                         if (name and param == name) or not name:
@@ -1218,13 +1263,13 @@ class DocsTools(object):
         """
         start, end = -1, -1
         stl_return = self.opt['return'][self.style['in']]['name']
-        if self.style['in'] in self.tagstyles + ['unknown']:
+        if self.style['in'] in self.tagstyles_unknown:
             idx = self.get_key_index(data, 'return')
             idx_abs = idx
             # search starting description
             if idx >= 0:
                 # FIXME: take care if a return description starts with <, >, =,...
-                m = re.match(r'\W*(\w+)', data[idx_abs + len(stl_return):])
+                m = FIRST_WORD_REGEX.match(data[idx_abs + len(stl_return):])
                 if m:
                     first = m.group(1)
                     idx = data[idx_abs:].find(first)
@@ -1257,14 +1302,14 @@ class DocsTools(object):
         """
         start, end = -1, -1
         stl_rtype = self.opt['rtype'][self.style['in']]['name']
-        if self.style['in'] in self.tagstyles + ['unknown']:
+        if self.style['in'] in self.tagstyles_unknown:
             dstart, dend = self.get_return_description_indexes(data)
             # search the start
             if dstart >= 0 and dend > 0:
                 idx = self.get_elem_index(data[dend:])
                 if idx >= 0 and data[dend + idx:].startswith(stl_rtype):
                     idx = dend + idx + len(stl_rtype)
-                    m = re.match(r'\W*(\w+)', data[idx:])
+                    m = FIRST_WORD_REGEX.match(data[idx:])
                     if m:
                         first = m.group(1)
                         start = data[idx:].find(first) + idx
@@ -1333,11 +1378,7 @@ class DocString(object):
             'rtype': None,
             }
         if docs_raw:
-            docs_raw = docs_raw.strip()
-            if docs_raw.startswith('"""') or docs_raw.startswith("'''"):
-                docs_raw = docs_raw[3:]
-            if docs_raw.endswith('"""') or docs_raw.endswith("'''"):
-                docs_raw = docs_raw[:-3]
+            docs_raw = strip_quotes(docs_raw)
         self.docs = {
             'in': {
                 'raw': docs_raw,
@@ -1368,6 +1409,7 @@ class DocString(object):
         self.parsed_elem = False
         self.parsed_docs = False
         self.generated_docs = False
+        self._unindented_raw = None
         self._options = {
             'hint_rtype_priority': True,  # priority in type hint else in docstring
             'hint_type_priority': True,  # priority in type hint else in docstring
@@ -1472,7 +1514,7 @@ class DocString(object):
         else:
             l = raw.strip()
         is_class = False
-        if l.startswith('async def ') or l.startswith('def ') or l.startswith('class '):
+        if l.startswith(('async def ', 'def ', 'class ')):
             # retrieves the type
             if l.startswith('def'):
                 self.element['deftype'] = 'def'
@@ -1488,40 +1530,27 @@ class DocString(object):
             self.element['name'] = l[:l.find('(')].strip()
             if not is_class:
                 extracted = self._extract_signature_elements(self._remove_signature_comment(l))
-                # remove self and cls parameters if any and also empty params (if no param)
-                remove_keys = []
-                for key in extracted['parameters']:
-                    if extracted['parameters'][key]['param'] in ['self', 'cls']:
-                        remove_keys.append(key)
-                    elif not extracted['parameters'][key]['param']:
-                        remove_keys.append(key)
-                for key in remove_keys:
-                    del extracted['parameters'][key]
                 if extracted['return_type']:
                     self.element['rtype'] = extracted['return_type'] # TODO manage this
-                self.element['params'].extend(extracted['parameters'].values())
+                # skip self and cls parameters if any and also empty params (if no param)
+                self.element['params'].extend(p for p in extracted['parameters'].values()
+                                              if p['param'] and p['param'] not in ['self', 'cls'])
         self.parsed_elem = True
 
     def _remove_signature_comment(self, txt):
         """If there is a comment at the end of the signature statement, remove it"""
-        ret = ""
         inside = None
         end_inside = {'(': ')', '{': '}', '[': ']', "'": "'", '"': '"'}
-        for c in txt:
-            if (inside and end_inside[inside] != c) or (not inside and c in end_inside.keys()):
+        for i, c in enumerate(txt):
+            if (inside and end_inside[inside] != c) or (not inside and c in end_inside):
                 if not inside:
                     inside = c
-                ret += c
-                continue
-            if inside and c == end_inside[inside]:
+            elif inside and c == end_inside[inside]:
                 inside = None
-                ret += c
-                continue
-            if not inside and c == '#':
+            elif not inside and c == '#':
                 # found a comment so signature is finished we stop parsing
-                break
-            ret += c
-        return ret
+                return txt[:i]
+        return txt
 
     def _extract_signature_elements(self, txt):
         start = txt.find('(') + 1
@@ -1583,6 +1612,21 @@ class DocString(object):
             'return_type': return_type.strip()
         }
 
+    def _get_unindented_raw(self):
+        """Get the input raw docstring without its trailing spaces and its indentation.
+        As every extraction step needs it, the result is computed once and reused
+        as long as neither the raw docstring nor the spaces changed.
+
+        :returns: the unindented input docstring
+        :rtype: str
+
+        """
+        raw, spaces = self.docs['in']['raw'], self.docs['out']['spaces']
+        if self._unindented_raw is None or self._unindented_raw[:2] != (raw, spaces):
+            data = '\n'.join([d.rstrip().replace(spaces, '', 1) for d in raw.splitlines()])
+            self._unindented_raw = (raw, spaces, data)
+        return self._unindented_raw[2]
+
     def _extract_docs_doctest(self):
         """Extract the doctests if found.
         If there are doctests, they are removed from the input data and set on
@@ -1594,7 +1638,6 @@ class DocString(object):
         data = self.docs['in']['raw']
         start, end = self.dst.get_doctests_indexes(data)
         while start != -1:
-            print (start, end)
             result = True
             datalst = data.splitlines()
             if self.docs['in']['doctests'] != "":
@@ -1611,7 +1654,7 @@ class DocString(object):
     def _extract_docs_description(self):
         """Extract main description from docstring"""
         # FIXME: the indentation of descriptions is lost
-        data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+        data = self._get_unindented_raw()
         if self.dst.style['in'] == 'groups':
             idx = self.dst.get_group_index(data)
         elif self.dst.style['in'] == 'google':
@@ -1620,14 +1663,16 @@ class DocString(object):
             if line_num == -1:
                 idx = -1
             else:
-                idx = len('\n'.join(lines[:line_num]))
+                # length of the lines before the section including their line breaks
+                idx = max(sum(map(len, lines[:line_num])) + line_num - 1, 0)
         elif self.dst.style['in'] == 'numpydoc':
             lines = data.splitlines()
             line_num = self.dst.numpydoc.get_next_section_start_line(lines)
             if line_num == -1:
                 idx = -1
             else:
-                idx = len('\n'.join(lines[:line_num]))
+                # length of the lines before the section including their line breaks
+                idx = max(sum(map(len, lines[:line_num])) + line_num - 1, 0)
         elif self.dst.style['in'] == 'unknown':
             idx = -1
         else:
@@ -1641,7 +1686,7 @@ class DocString(object):
 
     def _extract_groupstyle_docs_params(self):
         """Extract group style parameters"""
-        data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+        data = self._get_unindented_raw()
         idx = self.dst.get_group_key_line(data, 'param')
         if idx >= 0:
             data = data.splitlines()[idx + 1:]
@@ -1653,20 +1698,17 @@ class DocString(object):
                 param = None
                 desc = ''
                 ptype = ''
-                m = re.match(r'^\W*(\w+)[\W\s]+(\w[\s\w]+)', line.strip())
+                m = GROUP_PARAM_REGEX.match(line.strip())
                 if m:
                     param = m.group(1).strip()
-                    desc = m.group(2).strip()
-                else:
-                    m = re.match(r'^\W*(\w+)\W*', line.strip())
-                    if m:
-                        param = m.group(1).strip()
+                    if m.group(2):
+                        desc = m.group(2).strip()
                 if param:
                     self.docs['in']['params'].append((param, desc, ptype))
 
     def _extract_tagstyle_docs_params(self):
         """ """
-        data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+        data = self._get_unindented_raw()
         extracted = self.dst.extract_elements(data)
         for param_name, param in extracted.items():
             param_type = param['type']
@@ -1677,8 +1719,7 @@ class DocString(object):
 
     def _old_extract_tagstyle_docs_params(self):
         """ """
-        data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
-        listed = 0
+        data = self._get_unindented_raw()
         loop = True
         maxi = 10000  # avoid infinite loop but should never happen
         i = 0
@@ -1703,7 +1744,6 @@ class DocString(object):
                 # a parameter is stored with: (name, description, type)
                 self.docs['in']['params'].append((param, desc, ptype))
                 data = data[end:]
-                listed += 1
             else:
                 loop = False
         if i > maxi:
@@ -1715,10 +1755,10 @@ class DocString(object):
 
         """
         if self.dst.style['in'] == 'numpydoc':
-            data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+            data = self._get_unindented_raw()
             self.docs['in']['params'] += self.dst.numpydoc.get_param_list(data)
         elif self.dst.style['in'] == 'google':
-            data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+            data = self._get_unindented_raw()
             self.docs['in']['params'] += self.dst.googledoc.get_param_list(data)
         elif self.dst.style['in'] == 'groups':
             self._extract_groupstyle_docs_params()
@@ -1727,7 +1767,7 @@ class DocString(object):
 
     def _extract_groupstyle_docs_raises(self):
         """ """
-        data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+        data = self._get_unindented_raw()
         idx = self.dst.get_group_key_line(data, 'raise')
         if idx >= 0:
             data = data.splitlines()[idx + 1:]
@@ -1735,15 +1775,15 @@ class DocString(object):
             end = end if end != -1 else len(data)
             for i in range(end):
                 # FIXME: see how retrieve multiline raise description
-                line = data[i]
+                line = data[i].strip()
                 param = None
                 desc = ''
-                m = re.match(r'^\W*([\w.]+)[\W\s]+(\w[\s\w]+)', line.strip())
+                m = GROUP_RAISES_REGEX.match(line)
                 if m:
                     param = m.group(1).strip()
                     desc = m.group(2).strip()
                 else:
-                    m = re.match(r'^\W*(\w+)\W*', line.strip())
+                    m = FIRST_WORD_REGEX.match(line)
                     if m:
                         param = m.group(1).strip()
                 if param:
@@ -1751,8 +1791,7 @@ class DocString(object):
 
     def _extract_tagstyle_docs_raises(self):
         """ """
-        data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
-        listed = 0
+        data = self._get_unindented_raw()
         loop = True
         maxi = 10000  # avoid infinite loop but should never happen
         i = 0
@@ -1770,7 +1809,6 @@ class DocString(object):
                 # a parameter is stored with: (name, description)
                 self.docs['in']['raises'].append((param, desc))
                 data = data[end:]
-                listed += 1
             else:
                 loop = False
         if i > maxi:
@@ -1782,10 +1820,10 @@ class DocString(object):
 
         """
         if self.dst.style['in'] == 'numpydoc':
-            data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+            data = self._get_unindented_raw()
             self.docs['in']['raises'] += self.dst.numpydoc.get_raise_list(data)
         if self.dst.style['in'] == 'google':
-            data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+            data = self._get_unindented_raw()
             self.docs['in']['raises'] += self.dst.googledoc.get_raise_list(data)
         elif self.dst.style['in'] == 'groups':
             self._extract_groupstyle_docs_raises()
@@ -1795,7 +1833,7 @@ class DocString(object):
     def _extract_groupstyle_docs_return(self):
         """ """
         # TODO: manage rtype
-        data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+        data = self._get_unindented_raw()
         idx = self.dst.get_group_key_line(data, 'return')
         if idx >= 0:
             data = data.splitlines()[idx + 1:]
@@ -1806,7 +1844,7 @@ class DocString(object):
 
     def _extract_tagstyle_docs_return(self):
         """ """
-        data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+        data = self._get_unindented_raw()
         start, end = self.dst.get_return_description_indexes(data)
         if start >= 0:
             if end >= 0:
@@ -1823,12 +1861,12 @@ class DocString(object):
     def _extract_docs_return(self):
         """Extract return description and type"""
         if self.dst.style['in'] == 'numpydoc':
-            data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+            data = self._get_unindented_raw()
             self.docs['in']['return'] = self.dst.numpydoc.get_return_list(data)
             self.docs['in']['rtype'] = None
 # TODO: fix this
         elif self.dst.style['in'] == 'google':
-            data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
+            data = self._get_unindented_raw()
             self.docs['in']['return'] = self.dst.googledoc.get_return_list(data)
             self.docs['in']['rtype'] = None
         elif self.dst.style['in'] == 'groups':
@@ -1836,18 +1874,6 @@ class DocString(object):
         elif self.dst.style['in'] in ['javadoc', 'reST']:
             self._extract_tagstyle_docs_return()
 
-    def _extract_docs_other(self):
-        """Extract other specific sections"""
-        if self.dst.style['in'] == 'numpydoc':
-            data = '\n'.join([d.rstrip().replace(self.docs['out']['spaces'], '', 1) for d in self.docs['in']['raw'].splitlines()])
-            lst = self.dst.numpydoc.get_list_key(data, 'also')
-            lst = self.dst.numpydoc.get_list_key(data, 'ref')
-            lst = self.dst.numpydoc.get_list_key(data, 'note')
-            lst = self.dst.numpydoc.get_list_key(data, 'other')
-            lst = self.dst.numpydoc.get_list_key(data, 'example')
-            lst = self.dst.numpydoc.get_list_key(data, 'attr')
-            # TODO do something with this?
-
     def parse_docs(self, raw=None, before_lim=''):
         """Parses the docstring
 
@@ -1857,11 +1883,7 @@ class DocString(object):
         """
         self.before_lim = before_lim
         if raw is not None:
-            raw = raw.strip()
-            if raw.startswith('"""') or raw.startswith("'''"):
-                raw = raw[3:]
-            if raw.endswith('"""') or raw.endswith("'''"):
-                raw = raw[:-3]
+            raw = strip_quotes(raw)
             self.docs['in']['raw'] = raw
             self.dst.autodetect_style(raw)
         if self.docs['in']['raw'] is None:
@@ -1872,7 +1894,6 @@ class DocString(object):
         self._extract_docs_return()
         self._extract_docs_raises()
         self._extract_docs_description()
-        self._extract_docs_other()
         self.parsed_docs = True
 
     def _set_desc(self):
@@ -1887,25 +1908,23 @@ class DocString(object):
         """Sets the parameters with types, descriptions and default value if any
         taken from the input docstring and the signature parameters"""
         # TODO: manage different in/out styles
+        if not self.element['params']:
+            # the docstring's params not in the signature are dropped anyway
+            return
         # convert the list of signature's extracted params into a dict with the names of param as keys
-        sig_params = {e['param']: {'type': e['type'], 'default': e['default']} for e in self.element['params']}
+        # so that a param found several times (e.g. the definition being parsed again) is set once
+        sig_params = {e['param']: (e['type'], e['default']) for e in self.element['params']}
         # convert the list of docsting's extracted params into a dict with the names of param as keys
-        docs_params = {
-            name: {
-                'description': desc,
-                'type': param_type,
-            } for name, desc, param_type in self.docs['in']['params']
-        }
-        for name in sig_params:
+        docs_params = {name: (desc, param_type) for name, desc, param_type in self.docs['in']['params']}
+        for name, (sig_type, sig_default) in sig_params.items():
             # WARNING: Note that if a param in docstring isn't in the signature params, it will be dropped
-            sig_type, sig_default = sig_params[name]['type'], sig_params[name]['default']
             out_description = ""
             out_type = sig_type if sig_type else None
             out_default = sig_default if sig_default else None
             if name in docs_params:
-                out_description = docs_params[name]['description']
-                if not out_type or (not self._options['hint_type_priority'] and docs_params[name]['type']):
-                    out_type = docs_params[name]['type']
+                out_description, docs_type = docs_params[name]
+                if not out_type or (not self._options['hint_type_priority'] and docs_type):
+                    out_type = docs_type
             self.docs['out']['params'].append((name, out_description, out_type, out_default))
 
     def _set_raises(self):
@@ -1957,30 +1976,32 @@ class DocString(object):
         raw = '\n'
         if self.skip_empty and not self.docs['out']['params']:
             return raw
+        out_spaces = self.docs['out']['spaces']
         if self.dst.style['out'] == 'numpydoc':
             spaces = ' ' * self.num_of_spaces
-            with_space = lambda s: '\n'.join([self.docs['out']['spaces'] + spaces +\
+            indent = out_spaces + spaces
+            with_space = lambda s: '\n'.join([indent +\
                                                     l.lstrip() if i > 0 else\
                                                     l for i, l in enumerate(s.splitlines())])
-            raw += self.dst.numpydoc.get_key_section_header('param', self.docs['out']['spaces'])
+            raw += self.dst.numpydoc.get_key_section_header('param', out_spaces)
             for p in self.docs['out']['params']:
-                raw += self.docs['out']['spaces'] + p[0] + ' :'
+                raw += out_spaces + p[0] + ' :'
                 if p[2] is not None and len(p[2]) > 0:
                     raw += ' ' + p[2]
                 raw += '\n'
-                raw += self.docs['out']['spaces'] + spaces + with_space(p[1]).strip()
+                raw += out_spaces + spaces + with_space(p[1]).strip()
                 if len(p) > 2:
                     if 'default' not in p[1].lower() and len(p) > 3 and p[3] is not None:
                         raw += ' (Default value = ' + str(p[3]) + ')'
                 raw += '\n'
         elif self.dst.style['out'] == 'google':
             spaces = ' ' * self.num_of_spaces
-            with_space = lambda s: '\n'.join([self.docs['out']['spaces'] +\
+            with_space = lambda s: '\n'.join([out_spaces +\
                                                     l.lstrip() if i > 0 else\
                                                     l for i, l in enumerate(s.splitlines())])
-            raw += self.dst.googledoc.get_key_section_header('param', self.docs['out']['spaces'])
+            raw += self.dst.googledoc.get_key_section_header('param', out_spaces)
             for p in self.docs['out']['params']:
-                raw += self.docs['out']['spaces'] + spaces + p[0]
+                raw += out_spaces + spaces + p[0]
                 if p[2] is not None and len(p[2]) > 0:
                     raw += ' (' + p[2]
                     if len(p) > 3 and p[3] is not None:
@@ -1995,20 +2016,22 @@ class DocString(object):
             pass
         else:
             with_space = lambda s: '\n'.join(
-                [self.docs['out']['spaces'] + l if i > 0 else l for i, l in enumerate(s.splitlines())]
+                [out_spaces + l if i > 0 else l for i, l in enumerate(s.splitlines())]
             )
             if len(self.docs['out']['params']):
+                param_key = self.dst.get_key('param', 'out')
+                type_key = self.dst.get_key('type', 'out')
                 for p in self.docs['out']['params']:
-                    raw += self.docs['out']['spaces'] + self.dst.get_key('param', 'out') + ' ' + p[0] + sep + with_space(p[1]).strip()
+                    raw += out_spaces + param_key + ' ' + p[0] + sep + with_space(p[1]).strip()
                     if len(p) > 2:
                         if 'default' not in p[1].lower() and len(p) > 3 and p[3] is not None:
                             raw += ' (Default value = ' + str(p[3]) + ')'
                         if p[2] is not None and len(p[2]) > 0:
                             raw += '\n'
-                            raw += self.docs['out']['spaces'] + self.dst.get_key('type', 'out') + ' ' + p[0] + sep + p[2]
+                            raw += out_spaces + type_key + ' ' + p[0] + sep + p[2]
                     if self.type_stub and (len(p) <= 2 or p[2] is None or len(p[2]) == 0):
                         raw += '\n'
-                        raw += self.docs['out']['spaces'] + self.dst.get_key('type', 'out') + ' ' + p[0] + sep
+                        raw += out_spaces + type_key + ' ' + p[0] + sep
                     raw += '\n'
         return raw
 
@@ -2027,7 +2050,8 @@ class DocString(object):
                 if 'raise' in self.dst.numpydoc.get_mandatory_sections() or \
                         (self.docs['out']['raises'] and 'raise' in self.dst.numpydoc.get_optional_sections()):
                     spaces = ' ' * self.num_of_spaces
-                    with_space = lambda s: '\n'.join([self.docs['out']['spaces'] + spaces + l.lstrip() if i > 0 else l for i, l in enumerate(s.splitlines())])
+                    indent = self.docs['out']['spaces'] + spaces
+                    with_space = lambda s: '\n'.join([indent + l.lstrip() if i > 0 else l for i, l in enumerate(s.splitlines())])
                     raw += self.dst.numpydoc.get_key_section_header('raise', self.docs['out']['spaces'])
                     if len(self.docs['out']['raises']):
                         for p in self.docs['out']['raises']:
@@ -2040,7 +2064,8 @@ class DocString(object):
                 if 'raise' in self.dst.googledoc.get_mandatory_sections() or \
                         (self.docs['out']['raises'] and 'raise' in self.dst.googledoc.get_optional_sections()):
                     spaces = ' ' * self.num_of_spaces
-                    with_space = lambda s: '\n'.join([self.docs['out']['spaces'] + spaces + \
+                    indent = self.docs['out']['spaces'] + spaces
+                    with_space = lambda s: '\n'.join([indent + \
                                                             l.lstrip() if i > 0 else \
                                                             l for i, l in enumerate(s.splitlines())])
                     raw += self.dst.googledoc.get_key_section_header('raise', self.docs['out']['spaces'])
@@ -2082,7 +2107,8 @@ class DocString(object):
         if self.dst.style['out'] == 'numpydoc':
             raw += '\n'
             spaces = ' ' * self.num_of_spaces
-            with_space = lambda s: '\n'.join([self.docs['out']['spaces'] + spaces + l.lstrip() if i > 0 else l for i, l in enumerate(s.splitlines())])
+            indent = self.docs['out']['spaces'] + spaces
+            with_space = lambda s: '\n'.join([indent + l.lstrip() if i > 0 else l for i, l in enumerate(s.splitlines())])
             raw += self.dst.numpydoc.get_key_section_header('return', self.docs['out']['spaces'])
             if self.docs['out']['rtype']:
                 rtype = self.docs['out']['rtype']
@@ -2111,7 +2137,8 @@ class DocString(object):
         elif self.dst.style['out'] == 'google':
             raw += '\n'
             spaces = ' ' * self.num_of_spaces
-            with_space = lambda s: '\n'.join([self.docs['out']['spaces'] + spaces +\
+            indent = self.docs['out']['spaces'] + spaces
+            with_space = lambda s: '\n'.join([indent +\
                                                     l.lstrip() if i > 0 else\
                                                     l for i, l in enumerate(s.splitlines())])
             raw += self.dst.googledoc.get_key_section_header('return', self.docs['out']['spaces'])
@@ -2166,7 +2193,7 @@ class DocString(object):
         # sets the description section
         raw = self.docs['out']['spaces'] + self.before_lim + self.quotes
         desc = self.docs['out']['desc'].strip()
-        if not desc or not desc.count('\n'):
+        if not desc or '\n' not in desc:
             if not self.docs['out']['params'] and not self.docs['out']['return'] and not self.docs['out']['rtype'] and not self.docs['out']['raises']:
                 raw += desc if desc else self.trailing_space
                 raw += self.quotes
@@ -3,7 +3,6 @@
 import os
 import re
 import difflib
-import platform
 import sys
 
 from .docstring import DocString
@@ -14,6 +13,18 @@ __licence__ = "GPL3"
 __version__ = "0.4.0dev"
 __maintainer__ = "A. Daouzli"
 
+DOCSTRING_QUOTES_REGEX = re.compile('"""|\'\'\'')
+''' Matches any of the docstring delimiters'''
+
+ELEMENT_SPACES_REGEX = re.compile(r'^(\s*)[adc]')  # a for async, d for def, c for class
+''' Matches the indentation of an element definition'''
+
+ELEMENT_END_REGEX = re.compile(r''':(|\s*#[^'"]*)$''')
+''' Matches the end of an element definition: ':' eventually followed by a comment'''
+
+DOCSTRING_START_REGEX = re.compile('^[ruf]{0,2}(?:"""|\'\'\')')
+''' Matches the start of a docstring: the delimiter eventually prefixed by r, u, f or a combination'''
+
 #TODO:
 # -generate a return if return is used with argument in element
 # -generate raises if raises are used
@@ -110,7 +121,7 @@ class PyComment(object):
                 elem += l
                 if l.endswith(':'):
                     reading_element = 'end'
-            elif (l.startswith('async def ') or l.startswith('def ') or l.startswith('class ')) and not reading_docs:
+            elif l.startswith(('async def ', 'def ', 'class ')) and not reading_docs:
                 if self.ignore_private and l[l.find(' '):].strip().startswith("__"):
                     # If we were still looking for the class docstring, stop
                     # looking.  Otherwise we'll mistake this __dunder_method__
@@ -120,14 +131,14 @@ class PyComment(object):
                     continue
                 reading_element = 'start'
                 elem = l
-                m = re.match(r'^(\s*)[adc]', ln)  # a for async, d for def, c for class
+                m = ELEMENT_SPACES_REGEX.match(ln)
                 if m is not None and m.group(1) is not None:
                     spaces = m.group(1)
                 else:
                     spaces = ''
                 # the end of definition should be ':' and eventually a comment following
                 # FIXME: but this is missing eventually use of # inside a string value of parameter
-                if re.search(r''':(|\s*#[^'"]*)$''', l):
+                if ELEMENT_END_REGEX.search(l):
                     reading_element = 'end'
             if reading_element == 'end':
                 reading_element = None
@@ -145,26 +156,13 @@ class PyComment(object):
             else:
                 if waiting_docs and ('"""' in l or "'''" in l):
                     # not docstring
-                    if not reading_docs and not (
-                            l[:3] in ['"""', "'''"] or
-                            (l[0] in ['r', 'u', 'f'] and l[1:4] in ['"""', "'''"]) or
-                            (l[0] in ['r', 'u', 'f'] and l[1] in ['r', 'u', 'f'] and l[2:5] in ['"""', "'''"])
-                    ):
+                    if not reading_docs and not DOCSTRING_START_REGEX.match(l):
                         waiting_docs = False
                     # start of docstring bloc
                     elif not reading_docs:
                         start = i
-                        # determine which delimiter
-                        idx_c = l.find('"""')
-                        idx_dc = l.find("'''")
-                        lim = '"""'
-                        if idx_c >= 0 and idx_dc >= 0:
-                            if idx_c < idx_dc:
-                                lim = '"""'
-                            else:
-                                lim = "'''"
-                        elif idx_c < 0:
-                            lim = "'''"
+                        # determine which delimiter: the first one found
+                        lim = DOCSTRING_QUOTES_REGEX.search(l).group(0)
                         reading_docs = lim
                         # check if the docstring starts with 'r', 'u', or 'f' or combination thus extract it
                         if not l.startswith(lim):
@@ -203,12 +201,7 @@ class PyComment(object):
                     if reading_docs is not None:
                         raw += ln
         if self.convert_only:
-            i = 0
-            while i < len(elem_list):
-                if elem_list[i]['docs'].get_input_docstring() is None:
-                    elem_list.pop(i)
-                else:
-                    i += 1
+            elem_list = [e for e in elem_list if e['docs'].get_input_docstring() is not None]
         self.docs_list = elem_list
 
         self.parsed = True
@@ -257,10 +250,7 @@ class PyComment(object):
         """
         if not self.parsed:
             self._parse()
-        lst = []
-        for e in self.docs_list:
-            lst.append(e['docs'].get_raw_docs())
-        return lst
+        return [e['docs'].get_raw_docs() for e in self.docs_list]
 
     def compute_before_after(self):
         """Compute the list of lines before and after the proposed docstring changes.
@@ -280,8 +270,7 @@ class PyComment(object):
             else:
                 list_to.extend(list_from[last:start])
             docs = e['docs'].get_raw_docs()
-            list_docs = [l + '\n' for l in docs.splitlines()]
-            list_to.extend(list_docs)
+            list_to.extend(l + '\n' for l in docs.splitlines())
             last = end + 1
         if last < len(list_from):
             list_to.extend(list_from[last:])
@@ -300,6 +289,9 @@ class PyComment(object):
         :rtype: List[str]
         """
         list_from, list_to = self.compute_before_after()
+        if list_from == list_to:
+            # nothing changed so no need to run the sequence matching
+            return []
 
         if source_path.startswith(os.sep):
             source_path = source_path[1:]
@@ -313,7 +305,7 @@ class PyComment(object):
         fromfile = 'a/' + source_path + os.path.basename(self.input_file)
         tofile = 'b/' + target_path + os.path.basename(self.input_file)
         diff_list = difflib.unified_diff(list_from, list_to, fromfile, tofile)
-        return [d for d in diff_list]
+        return list(diff_list)
 
     def get_patch_lines(self, source_path, target_path):
         """Return the diff between source_path and target_path
@@ -338,7 +330,7 @@ class PyComment(object):
         :return: None
         """
         with open(patch_file, 'w') as f:
-            f.writelines(lines_to_write)
+            f.write(''.join(lines_to_write))
 
     def overwrite_source_file(self, lines_to_write):
         """overwrite the file with line_to_write
@@ -352,27 +344,15 @@ class PyComment(object):
         ok = False
         try:
             with open(tmp_filename, 'w') as fh:
-                fh.writelines(lines_to_write)
+                fh.write(''.join(lines_to_write))
             ok = True
         finally:
             if ok:
-                if platform.system() == 'Windows':
-                    self._windows_rename(tmp_filename)
-                else:
-                    os.rename(tmp_filename, self.input_file)
+                # unlike os.rename, os.replace also overwrites an existing file on Windows
+                os.replace(tmp_filename, self.input_file)
             else:
                 os.unlink(tmp_filename)
 
-    def _windows_rename(self, tmp_filename):
-        """ Workaround the fact that os.rename raises an OSError on Windows
-        
-        :param tmp_filename: The file to rename
-    
-        """
-
-        os.remove(self.input_file) if os.path.isfile(self.input_file) else None
-        os.rename(tmp_filename, self.input_file)
-
     def proceed(self):
         """Parses the input file and generates/converts the docstrings.
 
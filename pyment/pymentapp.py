@@ -3,6 +3,8 @@
 
 import glob
 import argparse
+import concurrent.futures
+import functools
 import os
 import sys
 
@@ -13,6 +15,9 @@ from pyment import __version__, __copyright__, __author__, __licence__
 MAX_DEPTH_RECUR = 50
 ''' The maximum depth to reach while recursively exploring sub folders'''
 
+BOOLEAN_CONFIG_KEYS = frozenset(['init2class', 'first_line', 'convert_only'])
+''' The configuration keys having a boolean value'''
+
 
 def get_files_from_dir(path, recursive=True, depth=0, file_ext='.py'):
     """Retrieve the list of files from a folder.
@@ -40,6 +45,35 @@ def get_files_from_dir(path, recursive=True, depth=0, file_ext='.py'):
     return file_list
 
 
+def tobool(s):
+    """Convert a string option to a boolean.
+
+    @param s: the string value
+    @return: True if the value is 'true' whatever the case, else False
+    @rtype: bool
+
+    """
+    return s.lower() == 'true'
+
+
+def positive_int(s):
+    """Convert a command line option to a positive integer.
+
+    @param s: the string value
+    @return: the integer value
+    @rtype: int
+    @raise argparse.ArgumentTypeError: if the value is not an integer greater than 0
+
+    """
+    try:
+        value = int(s)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError("invalid positive integer value: '{0}'".format(s))
+    return value
+
+
 def get_config(config_file):
     """Get the configuration from a file.
 
@@ -49,7 +83,6 @@ def get_config(config_file):
 
     """
     config = {}
-    tobool = lambda s: True if s.lower() == 'true' else False
     if config_file:
         try:
             f = open(config_file, 'r')
@@ -60,7 +93,7 @@ def get_config(config_file):
                 if len(line.strip()):
                     key, value = line.split("=", 1)
                     key, value = key.strip(), value.strip()
-                    if key in ['init2class', 'first_line', 'convert_only']:
+                    if key in BOOLEAN_CONFIG_KEYS:
                         value = tobool(value)
                     if key == 'indent':
                         value = int(value)
@@ -68,58 +101,98 @@ def get_config(config_file):
     return config
 
 
+def proceed_file(f, source, init2class=False, overwrite=False, **kwargs):
+    """Generate the docstrings of a file then overwrite it or get the lines of its patch.
+
+    @param f: the file to proceed. Use '-' to read from stdin
+    @param source: the file or folder given to pyment where the file was found
+    @param init2class: if True, the __init__ docstring is moved to the class if it has none
+    @param overwrite: if True, overwrite the file instead of providing a patch
+    @param kwargs: the options to pass to PyComment
+    @return: the file and the lines to write with write_output(). The lines are None
+      if the file was overwritten.
+    @rtype: tuple
+
+    """
+    if os.path.isdir(source):
+        path = source + os.sep + os.path.relpath(os.path.abspath(f), os.path.abspath(source))
+        path = path[:-len(os.path.basename(f))]
+    else:
+        path = ''
+    c = PyComment(f, **kwargs)
+    c.proceed()
+    if init2class:
+        c.docs_init_to_class()
+
+    if overwrite:
+        list_from, list_to = c.compute_before_after()
+        lines_to_write = list_to
+    else:
+        lines_to_write = c.get_patch_lines(path, path)
+
+    if overwrite and f != '-':
+        if list_from != list_to:
+            c.overwrite_source_file(lines_to_write)
+        lines_to_write = None
+    return f, lines_to_write
+
+
+def write_output(f, lines_to_write):
+    """Write the output of a proceeded file: its patch, or the result to stdout for '-'.
+
+    As files from different folders can have the same patch file name, this is
+    done by the main process in the files order, even if the files were proceeded
+    in parallel.
+
+    @param f: the proceeded file
+    @param lines_to_write: the lines to write as returned by proceed_file(). Nothing
+      is written if None.
+
+    """
+    if lines_to_write is None:
+        return
+    if f == '-':
+        sys.stdout.write(''.join(lines_to_write))
+    else:
+        with open(os.path.basename(f) + ".patch", 'w') as fh:
+            fh.write(''.join(lines_to_write))
+
+
 def run(source, files=[], input_style='auto', output_style='reST', first_line=True, quotes='"""',
         init2class=False, convert=False, config_file=None, ignore_private=False, overwrite=False, spaces=4,
-        skip_empty=False):
+        skip_empty=False, jobs=1):
     if input_style == 'auto':
         input_style = None
 
     config = get_config(config_file)
-    if 'init2class' in config:
-        init2class = config.pop('init2class')
-    if 'convert_only' in config:
-        convert = config.pop('convert_only')
-    if 'quotes' in config:
-        quotes = config.pop('quotes')
-    if 'input_style' in config:
-        input_style = config.pop('input_style')
-    if 'output_style' in config:
-        output_style = config.pop('output_style')
-    if 'first_line' in config:
-        first_line = config.pop('first_line')
-    for f in files:
-        if os.path.isdir(source):
-            path = source + os.sep + os.path.relpath(os.path.abspath(f), os.path.abspath(source))
-            path = path[:-len(os.path.basename(f))]
-        else:
-            path = ''
-        c = PyComment(f, quotes=quotes,
-                      input_style=input_style,
-                      output_style=output_style,
-                      first_line=first_line,
-                      ignore_private=ignore_private,
-                      convert_only=convert,
-                      num_of_spaces=spaces,
-                      skip_empty=skip_empty,
-                      **config)
-        c.proceed()
-        if init2class:
-            c.docs_init_to_class()
-
-        if overwrite:
-            list_from, list_to = c.compute_before_after()
-            lines_to_write = list_to
-        else:
-            lines_to_write = c.get_patch_lines(path, path)
-
-        if f == '-':
-            sys.stdout.writelines(lines_to_write)
-        else:
-            if overwrite:
-                if list_from != list_to:
-                    c.overwrite_source_file(lines_to_write)
-            else:
-                c.write_patch_file(os.path.basename(f) + ".patch", lines_to_write)
+    init2class = config.pop('init2class', init2class)
+    convert = config.pop('convert_only', convert)
+    quotes = config.pop('quotes', quotes)
+    input_style = config.pop('input_style', input_style)
+    output_style = config.pop('output_style', output_style)
+    first_line = config.pop('first_line', first_line)
+    options = dict(source=source, init2class=init2class, overwrite=overwrite,
+                   quotes=quotes,
+                   input_style=input_style,
+                   output_style=output_style,
+                   first_line=first_line,
+                   ignore_private=ignore_private,
+                   convert_only=convert,
+                   num_of_spaces=spaces,
+                   skip_empty=skip_empty,
+                   **config)
+    if len(files) > 1 and jobs > 1:
+        # the files are independent so they are proceeded in parallel
+        # send the files by chunks to reduce the communication with the workers
+        # while keeping several chunks per worker to balance their load
+        chunksize = max(1, len(files) // (4 * jobs))
+        proceed = functools.partial(proceed_file, **options)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            for f, lines_to_write in executor.map(proceed, files, chunksize=chunksize):
+                write_output(f, lines_to_write)
+    else:
+        for f in files:
+            write_output(*proceed_file(f, **options))
 
 
 def main():
@@ -152,6 +225,9 @@ def main():
     parser.add_argument('-e', '--skip-empty', action='store_true', dest='skip_empty',
                         default=False,
                         help="Don't write params, returns, or raises sections if they are empty.")
+    parser.add_argument('-j', '--jobs', metavar='jobs', dest='jobs', default=None, type=positive_int,
+                        help="The number of files to proceed in parallel. Default is the number of CPUs. "
+                             "Use 1 to proceed the files one after the other.")
     # parser.add_argument('-c', '--config', metavar='config_file',
     #                   dest='config', help='Configuration file')
 
@@ -166,13 +242,18 @@ def main():
         config_file = ''
     else:
         config_file = args.config_file
+    jobs = args.jobs
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+        if sys.platform == 'win32':
+            # ProcessPoolExecutor refuses more than 61 workers on Windows
+            jobs = min(jobs, 61)
 
-    tobool = lambda s: True if s.lower() == 'true' else False
     run(source, files, args.input, args.output,
         tobool(args.first_line), args.quotes,
         args.init2class, args.convert, config_file,
         tobool(args.ignore_private), overwrite=args.overwrite,
-        spaces=args.spaces, skip_empty=args.skip_empty)
+        spaces=args.spaces, skip_empty=args.skip_empty, jobs=jobs)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import os
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
@@ -229,6 +230,17 @@ class AppTests(unittest.TestCase):
             expected_returncode=2
         )
 
+    def testJobsNotPositive(self):
+        # Ensure the app outputs an error if the number of jobs is lower than 1.
+        for jobs in ('0', '-1'):
+            self.runPymentAppAndAssertIsExpected(
+                cmd_args="-j {} -".format(jobs),
+                write_to_stdin=None,
+                expected_stderr=re.compile(
+                    r"pymentapp\.py: error: argument -j/--jobs: invalid positive integer value: '{}'".format(jobs)),
+                expected_returncode=2
+            )
+
     def testStdinPatchMode(self):
         # Test non overwrite mode when using stdin - which means a patch will be written to stdout
         self.runPymentAppAndAssertIsExpected(
@@ -364,6 +376,71 @@ class AppTests(unittest.TestCase):
             output_format=self.OUTPUT_FORMAT
         )
 
+    def testOverwriteSeveralFiles(self):
+        # Check 'overwrite' mode with a folder: its files are proceeded in parallel with
+        # '-j 2' (or serially with '-j 1') and each one must get the same result as a
+        # file proceeded alone.
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            single_filename = os.path.join(tmp_dir, 'single.py')
+            folder = os.path.join(tmp_dir, 'folder')
+            os.mkdir(folder)
+            filenames = [os.path.join(folder, 'file{}.py'.format(i)) for i in range(4)]
+            for filename in [single_filename] + filenames:
+                with open(filename, 'w') as f:
+                    f.write(self.INPUT)
+
+            self.runPymentAppAndAssertIsExpected(
+                cmd_args='-w {}'.format(single_filename),
+                output_format=self.OUTPUT_FORMAT,
+            )
+            with open(single_filename) as f:
+                expected = f.read()
+            self.assertNotEqual(expected, self.INPUT)
+
+            for jobs in ('-j 2 ', '-j 1 '):
+                for filename in filenames:
+                    with open(filename, 'w') as f:
+                        f.write(self.INPUT)
+                self.runPymentAppAndAssertIsExpected(
+                    cmd_args='-w {}{}'.format(jobs, folder),
+                    output_format=self.OUTPUT_FORMAT,
+                )
+                for filename in filenames:
+                    with open(filename) as f:
+                        self.assertEqual(f.read(), expected)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def testPatchSeveralFilesSameName(self):
+        # Check patch mode with files having the same name in different sub-folders:
+        # they share the same patch file, that must be written in the files order as when
+        # proceeded serially, even if they are proceeded in parallel.
+        tmp_dir = tempfile.mkdtemp()
+        patch_filename = os.path.join(self.CWD, 'mod.py.patch')
+        try:
+            for sub_folder, functions in (('z', 3000), ('d', 1)):
+                os.makedirs(os.path.join(tmp_dir, 'src', sub_folder))
+                with open(os.path.join(tmp_dir, 'src', sub_folder, 'mod.py'), 'w') as f:
+                    f.write(''.join('def func{}(a, b):\n    pass\n\n'.format(i) for i in range(functions)))
+
+            patches = []
+            for jobs in ('-j 1', '-j 2'):
+                self.runPymentAppAndAssertIsExpected(
+                    cmd_args='{} {}'.format(jobs, os.path.join(tmp_dir, 'src')),
+                    output_format=self.OUTPUT_FORMAT,
+                )
+                with open(patch_filename) as f:
+                    patches.append(f.read())
+                os.remove(patch_filename)
+
+            self.assertEqual(patches[0].count('\n--- a/'), 1)
+            self.assertEqual(patches[1], patches[0])
+        finally:
+            shutil.rmtree(tmp_dir)
+            if os.path.isfile(patch_filename):
+                os.remove(patch_filename)
+
 
 def main():
     unittest.main()
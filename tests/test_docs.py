@@ -398,6 +398,15 @@ class DocStringTests(unittest.TestCase):
         # param's description
         self.assertTrue(d.docs['out']['params'][1][1].startswith("the 2"))
 
+    def testGeneratingDocsParamsDefinitionParsedTwice(self):
+        doc = mydocs
+        d = docs.DocString(myelem, '    ', doc)
+        d.parse_definition(myelem)
+        d.parse_docs()
+        d.generate_docs()
+        self.assertTrue(len(d.docs['out']['params']) == 3)
+        self.assertTrue(d.docs['out']['params'][2] == ('third', '', None, '"value"'))
+
     def testGeneratingDocsParamsTypeStubs(self):
         doc = mydocs
         d = docs.DocString(myelem, '    ', doc, type_stub=True)
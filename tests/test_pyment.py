@@ -88,17 +88,14 @@ class DocStringTests(unittest.TestCase):
         self.assertTrue('third' in p.get_output_docs()[13])
         self.assertTrue('multiline' in p.get_output_docs()[13])
 
-    def testWindowsRename(self):
-        bar = absdir("bar")
-        with open(bar, "w") as fbar:
-            fbar.write("bar")
+    def testOverwriteSourceFile(self):
         p = pym.PyComment(foo)
-        p._windows_rename(bar)
-        self.assertFalse(os.path.isfile(bar))
+        p.overwrite_source_file(["bar\n", "baz\n"])
+        self.assertFalse(os.path.isfile(foo + ".writing"))
         self.assertTrue(os.path.isfile(foo))
         with open(foo, "r") as fooo:
             foo_txt = fooo.read()
-        self.assertTrue(foo_txt == "bar")
+        self.assertTrue(foo_txt == "bar\nbaz\n")
 
 
 def main():